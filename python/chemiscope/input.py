@@ -167,26 +167,7 @@ def create_input(frames, meta=None, properties=None, cutoff=None, composition=Fa
     .. _`ase.Atoms`: https://wiki.fysik.dtu.dk/ase/ase/atoms.html
     """
 
-    data = {"meta": {}}
-    if meta is not None:
-        if "name" in meta:
-            data["meta"]["name"] = str(meta["name"])
-
-        if "description" in meta:
-            data["meta"]["description"] = str(meta["description"])
-
-        if "authors" in meta:
-            data["meta"]["authors"] = list(map(str, meta["authors"]))
-
-        if "references" in meta:
-            data["meta"]["references"] = list(map(str, meta["references"]))
-
-        for key in meta.keys():
-            if key not in ["name", "description", "authors", "references"]:
-                warnings.warn(f"ignoring unexpected metadata: {key}")
-
-    if "name" not in data["meta"] or not data["meta"]["name"]:
-        data["meta"]["name"] = "<unknown>"
+    data = {"meta": _validate_meta(meta)}
 
     data["structures"] = frames_to_json(frames)
     n_structures = len(data["structures"])
@@ -194,19 +175,21 @@ def create_input(frames, meta=None, properties=None, cutoff=None, composition=Fa
 
     data["properties"] = {}
     if properties is not None:
-        properties = _expand_properties(properties, n_structures, n_atoms)
-        for name, value in properties.items():
-            _validate_property(name, value)
-            data["properties"].update(_linearize(name, value, n_structures, n_atoms))
+        data["properties"].update(
+            _validate_properties(properties, n_structures, n_atoms)
+        )
 
     # Read properties coming from the frames
-    for name, value in atom_properties(frames, composition).items():
-        _validate_property(name, value)
-        data["properties"].update(_linearize(name, value, n_structures, n_atoms))
-
-    for name, value in structure_properties(frames, composition).items():
-        _validate_property(name, value)
-        data["properties"].update(_linearize(name, value, n_structures, n_atoms))
+    data["properties"].update(
+        _validate_properties(
+            atom_properties(frames, composition), n_structures, n_atoms
+        )
+    )
+    data["properties"].update(
+        _validate_properties(
+            structure_properties(frames, composition), n_structures, n_atoms
+        )
+    )
 
     if cutoff is not None:
         data["environments"] = _generate_environments(frames, cutoff)
@@ -299,10 +282,16 @@ def _typetransform(data, name):
     """
     Transform the given data to either a list of string or a list of floats.
 
-    :param data: list of unknown type to be converted
+    :param data: list or 1-D numpy array of unknown type to be converted
     :param name: name of the property related to this data, to be used in
                  error messages
     """
+    if isinstance(data, np.ndarray):
+        if data.dtype.kind == "U" and len(data) > 0:
+            # all the values are already strings, no need to check them
+            return data.tolist()
+        data = list(data)
+
     assert isinstance(data, list) and len(data) > 0
     if isinstance(data[0], str):
         return list(map(str, data))
@@ -344,19 +333,19 @@ def _linearize(name, property, n_structures, n_atoms):
         if len(property["values"].shape) == 1:
             data[name] = {
                 "target": property["target"],
-                "values": _typetransform(list(property["values"]), name),
+                "values": _typetransform(property["values"], name),
             }
         elif len(property["values"].shape) == 2:
             if property["values"].shape[1] == 1:
                 data[name] = {
                     "target": property["target"],
-                    "values": _typetransform(list(property["values"]), name),
+                    "values": _typetransform(property["values"].ravel(), name),
                 }
             else:
                 for i in range(property["values"].shape[1]):
                     data[f"{name}[{i + 1}]"] = {
                         "target": property["target"],
-                        "values": _typetransform(list(property["values"][:, i]), name),
+                        "values": _typetransform(property["values"][:, i], name),
                     }
         else:
             raise Exception("unsupported ndarray property")
@@ -408,6 +397,56 @@ def _generate_environments(frames, cutoff):
     return environments
 
 
+def _validate_meta(meta):
+    """
+    Validate the dataset metadata in ``meta`` and convert it to the format
+    expected by chemiscope, using ``"<unknown>"`` as the default name.
+
+    :param dict meta: metadata of the dataset, or ``None``
+    """
+    result = {}
+    if meta is not None:
+        if "name" in meta:
+            result["name"] = str(meta["name"])
+
+        if "description" in meta:
+            result["description"] = str(meta["description"])
+
+        if "authors" in meta:
+            result["authors"] = list(map(str, meta["authors"]))
+
+        if "references" in meta:
+            result["references"] = list(map(str, meta["references"]))
+
+        for key in meta.keys():
+            if key not in ["name", "description", "authors", "references"]:
+                warnings.warn(f"ignoring unexpected metadata: {key}")
+
+    if "name" not in result or not result["name"]:
+        result["name"] = "<unknown>"
+
+    return result
+
+
+def _validate_properties(properties, n_structures, n_atoms):
+    """
+    Validate all the given ``properties``, and convert them to the linearized
+    format used by chemiscope.
+
+    :param dict properties: properties to validate, in shortened or expanded
+                            form
+    :param int n_structures: number of structures in the dataset
+    :param int n_atoms: total number of atoms in the whole dataset
+    """
+    properties = _expand_properties(properties, n_structures, n_atoms)
+
+    result = {}
+    for name, value in properties.items():
+        _validate_property(name, value)
+        result.update(_linearize(name, value, n_structures, n_atoms))
+    return result
+
+
 def _validate_property(name, property):
     if name == "":
         raise Exception("the name of a property can not be the empty string")
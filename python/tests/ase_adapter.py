@@ -44,14 +44,14 @@ class TestASEAdapter(unittest.TestCase):
 
     def test_arrays_numbers_postions_ignored(self):
         data = create_input(BASE_FRAME)
-        self.assertEqual(len(BASE_FRAME.arrays.keys()), 2)
-        self.assertEqual(len(data["properties"].keys()), 0)
+        self.assertEqual(len(BASE_FRAME.arrays), 2)
+        self.assertEqual(len(data["properties"]), 0)
 
     def test_arrays_as_atom_properties(self):
         frame = BASE_FRAME.copy()
         frame.arrays["bar"] = [4, 5, 6]
         data = create_input([frame])
-        self.assertEqual(len(data["properties"].keys()), 1)
+        self.assertEqual(len(data["properties"]), 1)
         self.assertEqual(data["properties"]["bar"]["target"], "atom")
         self.assertEqual(data["properties"]["bar"]["values"], [4, 5, 6])
         self.assertEqual(data["properties"]["bar"].get("units"), None)
@@ -64,7 +64,7 @@ class TestASEAdapter(unittest.TestCase):
         frame2 = BASE_FRAME.copy()
         frame2.info["bar"] = 6
         data = create_input([frame, frame2])
-        self.assertEqual(len(data["properties"].keys()), 1)
+        self.assertEqual(len(data["properties"]), 1)
         self.assertEqual(data["properties"]["bar"]["target"], "structure")
         self.assertEqual(data["properties"]["bar"]["values"], [4, 6])
         self.assertEqual(data["properties"]["bar"].get("units"), None)
@@ -89,7 +89,7 @@ class TestASEAdapter(unittest.TestCase):
             ),
         )
 
-        self.assertEqual(len(data["properties"].keys()), 1)
+        self.assertEqual(len(data["properties"]), 1)
         self.assertEqual(data["properties"]["bar"]["target"], "atom")
         self.assertEqual(data["properties"]["bar"]["values"], [4, 5, 6, -1, 2, 3])
         self.assertEqual(data["properties"]["bar"].get("units"), None)
@@ -114,7 +114,7 @@ class TestASEAdapter(unittest.TestCase):
             ),
         )
 
-        self.assertEqual(len(data["properties"].keys()), 1)
+        self.assertEqual(len(data["properties"]), 1)
         self.assertEqual(data["properties"]["bar"]["target"], "structure")
         self.assertEqual(data["properties"]["bar"]["values"], [4, -1])
         self.assertEqual(data["properties"]["bar"].get("units"), None)
@@ -135,7 +135,7 @@ class TestASEAdapter(unittest.TestCase):
             ),
         )
 
-        self.assertEqual(len(data["properties"].keys()), 0)
+        self.assertEqual(len(data["properties"]), 0)
 
 
 if __name__ == "__main__":
@@ -1,195 +1,184 @@
 import unittest
+from unittest import mock
 import numpy as np
 import ase
 
+import chemiscope.input
 from chemiscope import create_input
+from chemiscope.input import _validate_meta, _validate_properties
 
-TEST_FRAMES = [ase.Atoms("CO2")]
+__all__ = ["TEST_FRAMES"]
 
+# these frames are shared between all tests, which must not use
+# create_input(composition=True) since it adds properties to the frames
+TEST_FRAMES = (ase.Atoms("CO2"),)
+_TEST_FRAMES_2X = TEST_FRAMES + TEST_FRAMES
 
-class TestCreateInputMeta(unittest.TestCase):
-    def test_meta(self):
-        meta = {}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "<unknown>")
-        self.assertEqual(len(data["meta"].keys()), 1)
-
-        meta = {"name": ""}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "<unknown>")
-        self.assertEqual(len(data["meta"].keys()), 1)
-
-        meta = {"name": "foo"}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(len(data["meta"].keys()), 1)
-
-        meta = {"name": "foo", "description": "bar"}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(data["meta"]["description"], "bar")
-        self.assertEqual(len(data["meta"].keys()), 2)
-
-        meta = {"name": "foo", "references": ["bar"]}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(len(data["meta"]["references"]), 1)
-        self.assertEqual(data["meta"]["references"][0], "bar")
-        self.assertEqual(len(data["meta"].keys()), 2)
+# ndarray property values, shared between tests. They are made read-only to
+# make sure no test modifies them (_VALS_NX1 is a view of _VALS_N)
+_VALS_N = np.asarray([2, 3, 4], dtype=np.int64)
+_VALS_N_STR = np.asarray(["2", "3", "4"], dtype="U1")
+_VALS_NX3 = np.tile(np.asarray([1, 2, 4], dtype=np.int64), (3, 1))
+_VALS_N.setflags(write=False)
+_VALS_N_STR.setflags(write=False)
+_VALS_NX3.setflags(write=False)
+_VALS_NX1 = _VALS_N.reshape(3, 1)
 
+
+class TestCreateInputMeta(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
         meta = {"name": "foo", "authors": ["bar"]}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(len(data["meta"]["authors"]), 1)
-        self.assertEqual(data["meta"]["authors"][0], "bar")
-        self.assertEqual(len(data["meta"].keys()), 2)
+        cls.data = create_input(frames=TEST_FRAMES, meta=meta)
+
+    def test_meta(self):
+        self.assertEqual(self.data["meta"], {"name": "foo", "authors": ["bar"]})
+
+        cases = [
+            ({}, {"name": "<unknown>"}),
+            ({"name": ""}, {"name": "<unknown>"}),
+            ({"name": "foo"}, {"name": "foo"}),
+            (
+                {"name": "foo", "description": "bar"},
+                {"name": "foo", "description": "bar"},
+            ),
+            (
+                {"name": "foo", "references": ["bar"]},
+                {"name": "foo", "references": ["bar"]},
+            ),
+            (
+                {"name": "foo", "authors": ["bar"]},
+                {"name": "foo", "authors": ["bar"]},
+            ),
+        ]
+        for meta, expected in cases:
+            with self.subTest(meta=meta):
+                self.assertEqual(_validate_meta(meta), expected)
 
     def test_meta_unknown_keys_warning(self):
         meta = {"name": "foo", "what_is_this": "I don't know"}
         with self.assertWarns(UserWarning) as cm:
-            data = create_input(frames=TEST_FRAMES, meta=meta)
+            result = _validate_meta(meta)
 
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(len(data["meta"].keys()), 1)
+        self.assertEqual(result, {"name": "foo"})
 
         self.assertEqual(
             cm.warning.args, ("ignoring unexpected metadata: what_is_this",)
         )
 
     def test_meta_conversions(self):
-        meta = {"name": 33}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "33")
-        self.assertEqual(len(data["meta"].keys()), 1)
-
-        meta = {"name": ["foo", "bar"], "description": False}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "['foo', 'bar']")
-        self.assertEqual(data["meta"]["description"], "False")
-        self.assertEqual(len(data["meta"].keys()), 2)
-
-        meta = {"name": "foo", "references": (3, False)}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(len(data["meta"]["references"]), 2)
-        self.assertEqual(data["meta"]["references"][0], "3")
-        self.assertEqual(data["meta"]["references"][1], "False")
-        self.assertEqual(len(data["meta"].keys()), 2)
-
-        meta = {"name": "foo", "authors": (3, False)}
-        data = create_input(frames=TEST_FRAMES, meta=meta)
-        self.assertEqual(data["meta"]["name"], "foo")
-        self.assertEqual(len(data["meta"]["authors"]), 2)
-        self.assertEqual(data["meta"]["authors"][0], "3")
-        self.assertEqual(data["meta"]["authors"][1], "False")
-        self.assertEqual(len(data["meta"].keys()), 2)
+        cases = [
+            ({"name": 33}, {"name": "33"}),
+            (
+                {"name": ["foo", "bar"], "description": False},
+                {"name": "['foo', 'bar']", "description": "False"},
+            ),
+            (
+                {"name": "foo", "references": (3, False)},
+                {"name": "foo", "references": ["3", "False"]},
+            ),
+            (
+                {"name": "foo", "authors": (3, False)},
+                {"name": "foo", "authors": ["3", "False"]},
+            ),
+        ]
+        for meta, expected in cases:
+            with self.subTest(meta=meta):
+                self.assertEqual(_validate_meta(meta), expected)
 
 
 class TestCreateInputProperties(unittest.TestCase):
     def test_properties(self):
-        # values are numbers
-        properties = {"name": {"target": "atom", "values": [2, 3, 4]}}
-        data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["values"], [2, 3, 4])
-        self.assertEqual(len(data["properties"]["name"].keys()), 2)
-
-        # values are strings
-        properties = {"name": {"target": "atom", "values": ["2", "3", "4"]}}
-        data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["values"], ["2", "3", "4"])
-        self.assertEqual(len(data["properties"]["name"].keys()), 2)
-
-        properties = {
-            "name": {
-                "target": "atom",
-                "values": [2, 3, 4],
-                "description": "foo",
-            },
-        }
-        data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["description"], "foo")
-        self.assertEqual(data["properties"]["name"]["values"], [2, 3, 4])
-        self.assertEqual(len(data["properties"]["name"].keys()), 3)
-
-        properties = {
-            "name": {
-                "target": "atom",
-                "values": [2, 3, 4],
-                "units": "foo",
-            },
-        }
-        data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["units"], "foo")
-        self.assertEqual(data["properties"]["name"]["values"], [2, 3, 4])
-        self.assertEqual(len(data["properties"]["name"].keys()), 3)
+        cases = [
+            # values are numbers
+            (
+                {"name": {"target": "atom", "values": [2, 3, 4]}},
+                {"target": "atom", "values": [2, 3, 4]},
+            ),
+            # values are strings
+            (
+                {"name": {"target": "atom", "values": ["2", "3", "4"]}},
+                {"target": "atom", "values": ["2", "3", "4"]},
+            ),
+            (
+                {"name": {"target": "atom", "values": [2, 3, 4], "description": "foo"}},
+                {"target": "atom", "values": [2, 3, 4], "description": "foo"},
+            ),
+            (
+                {"name": {"target": "atom", "values": [2, 3, 4], "units": "foo"}},
+                {"target": "atom", "values": [2, 3, 4], "units": "foo"},
+            ),
+        ]
+        for properties, expected in cases:
+            with self.subTest(properties=properties):
+                data = create_input(frames=TEST_FRAMES, properties=properties)
+                self.assertEqual(data["properties"], {"name": expected})
 
     def test_ndarray_properties(self):
         # shape N
-        properties = {"name": {"target": "atom", "values": np.array([2, 3, 4])}}
+        properties = {"name": {"target": "atom", "values": _VALS_N}}
         data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["values"], [2, 3, 4])
-        self.assertEqual(len(data["properties"].keys()), 1)
+        self.assertEqual(
+            data["properties"], {"name": {"target": "atom", "values": [2, 3, 4]}}
+        )
 
         # shape N
-        properties = {"name": {"target": "atom", "values": np.array(["2", "3", "4"])}}
+        properties = {"name": {"target": "atom", "values": _VALS_N_STR}}
         data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["values"], ["2", "3", "4"])
-        self.assertEqual(len(data["properties"].keys()), 1)
+        self.assertEqual(
+            data["properties"],
+            {"name": {"target": "atom", "values": ["2", "3", "4"]}},
+        )
 
         # shape N x 1
-        properties = {"name": {"target": "atom", "values": np.array([[2], [3], [4]])}}
-        data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["values"], [2, 3, 4])
-        self.assertEqual(len(data["properties"].keys()), 1)
+        properties = {"name": {"target": "atom", "values": _VALS_NX1}}
+        with mock.patch(
+            "chemiscope.input._typetransform", wraps=chemiscope.input._typetransform
+        ) as typetransform:
+            data = create_input(frames=TEST_FRAMES, properties=properties)
+        # the values should be flattened without copying them
+        self.assertTrue(np.shares_memory(typetransform.call_args[0][0], _VALS_NX1))
+        self.assertEqual(
+            data["properties"], {"name": {"target": "atom", "values": [2, 3, 4]}}
+        )
 
         # shape N x 3
-        properties = {
-            "name": {
-                "target": "atom",
-                "values": np.array([[1, 2, 4], [1, 2, 4], [1, 2, 4]]),
-            }
-        }
+        properties = {"name": {"target": "atom", "values": _VALS_NX3}}
         data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name[1]"]["target"], "atom")
-        self.assertEqual(data["properties"]["name[1]"]["values"], [1, 1, 1])
-        self.assertEqual(data["properties"]["name[2]"]["target"], "atom")
-        self.assertEqual(data["properties"]["name[2]"]["values"], [2, 2, 2])
-        self.assertEqual(data["properties"]["name[3]"]["target"], "atom")
-        self.assertEqual(data["properties"]["name[3]"]["values"], [4, 4, 4])
-        self.assertEqual(len(data["properties"].keys()), 3)
+        self.assertEqual(
+            data["properties"],
+            {
+                "name[1]": {"target": "atom", "values": [1, 1, 1]},
+                "name[2]": {"target": "atom", "values": [2, 2, 2]},
+                "name[3]": {"target": "atom", "values": [4, 4, 4]},
+            },
+        )
 
     def test_shortened_properties(self):
         # atom property
         properties = {"name": [2, 3, 4]}
         data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "atom")
-        self.assertEqual(data["properties"]["name"]["values"], [2, 3, 4])
-        self.assertEqual(len(data["properties"]["name"].keys()), 2)
+        self.assertEqual(
+            data["properties"], {"name": {"target": "atom", "values": [2, 3, 4]}}
+        )
 
         # frame property
         properties = {"name": [2]}
         data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name"]["target"], "structure")
-        self.assertEqual(data["properties"]["name"]["values"], [2])
-        self.assertEqual(len(data["properties"]["name"].keys()), 2)
+        self.assertEqual(
+            data["properties"], {"name": {"target": "structure", "values": [2]}}
+        )
 
         # ndarray frame property
         properties = {"name": np.array([[2, 4]])}
         data = create_input(frames=TEST_FRAMES, properties=properties)
-        self.assertEqual(data["properties"]["name[1]"]["target"], "structure")
-        self.assertEqual(data["properties"]["name[1]"]["values"], [2])
-        self.assertEqual(len(data["properties"]["name[1]"].keys()), 2)
-
-        self.assertEqual(data["properties"]["name[2]"]["target"], "structure")
-        self.assertEqual(data["properties"]["name[2]"]["values"], [4])
-        self.assertEqual(len(data["properties"]["name[2]"].keys()), 2)
+        self.assertEqual(
+            data["properties"],
+            {
+                "name[1]": {"target": "structure", "values": [2]},
+                "name[2]": {"target": "structure", "values": [4]},
+            },
+        )
 
     def test_shortened_properties_errors(self):
         properties = {"name": ["2", "3"]}
@@ -226,14 +215,14 @@ class TestCreateInputProperties(unittest.TestCase):
     def test_invalid_name(self):
         properties = {"": {"target": "atom", "values": [2, 3, 4]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception), "the name of a property can not be the empty string"
         )
 
         properties = {False: {"target": "atom", "values": [2, 3, 4]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception),
             "the name of a property name must be a string, "
@@ -243,12 +232,12 @@ class TestCreateInputProperties(unittest.TestCase):
     def test_invalid_target(self):
         properties = {"name": {"values": [2, 3, 4]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(str(cm.exception), "missing 'target' for the 'name' property")
 
         properties = {"name": {"target": "atoms", "values": [2, 3, 4]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception),
             "the target must be 'atom' or 'structure' for the 'name' property",
@@ -268,27 +257,27 @@ class TestCreateInputProperties(unittest.TestCase):
     def test_property_unknown_keys_warning(self):
         properties = {"name": {"target": "atom", "values": [2, 3, 4], "what": False}}
         with self.assertWarns(UserWarning) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(cm.warning.args, ("ignoring unexpected property key: what",))
 
     def test_invalid_values_types(self):
         properties = {"name": {"target": "atom", "values": 3}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception), "unknown type (<class 'int'>) for property 'name'"
         )
 
         properties = {"name": {"target": "atom", "values": {"test": "bad"}}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception), "unknown type (<class 'dict'>) for property 'name'"
         )
 
         properties = {"name": {"target": "atom", "values": [{}, {}, {}]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception),
             "unsupported type in property 'name' values: should be string or number",
@@ -297,7 +286,7 @@ class TestCreateInputProperties(unittest.TestCase):
     def test_wrong_number_of_values(self):
         properties = {"name": {"target": "atom", "values": [2, 3]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception),
             "wrong size for the property 'name' with target=='atom': "
@@ -306,7 +295,7 @@ class TestCreateInputProperties(unittest.TestCase):
 
         properties = {"name": {"target": "structure", "values": [2, 3, 5]}}
         with self.assertRaises(Exception) as cm:
-            create_input(frames=TEST_FRAMES, properties=properties)
+            _validate_properties(properties, n_structures=1, n_atoms=3)
         self.assertEqual(
             str(cm.exception),
             "wrong size for the property 'name' with target=='structure': "
@@ -316,7 +305,7 @@ class TestCreateInputProperties(unittest.TestCase):
 
 class TestCreateInputEnvironments(unittest.TestCase):
     def test_environment(self):
-        data = create_input(frames=TEST_FRAMES + TEST_FRAMES, cutoff=3.5)
+        data = create_input(frames=_TEST_FRAMES_2X, cutoff=3.5)
         self.assertEqual(len(data["environments"]), 6)
 
         for i, env in enumerate(data["environments"]):
@@ -341,5 +330,21 @@ class TestCreateInputEnvironments(unittest.TestCase):
         )
 
 
+class TestCreateInputFrames(unittest.TestCase):
+    def test_frames_not_modified(self):
+        # TEST_FRAMES is shared between all tests, so create_input must not
+        # modify it
+        frame = TEST_FRAMES[0]
+        positions = frame.positions.copy()
+        numbers = frame.numbers.copy()
+
+        create_input(frames=TEST_FRAMES, properties={"name": [2, 3, 4]}, cutoff=3.5)
+
+        self.assertEqual(frame.info, {})
+        self.assertEqual(sorted(frame.arrays.keys()), ["numbers", "positions"])
+        self.assertTrue(np.array_equal(frame.positions, positions))
+        self.assertTrue(np.array_equal(frame.numbers, numbers))
+
+
 if __name__ == "__main__":
     unittest.main()